@@ -3,11 +3,14 @@ Discord bot for tracking flights using fast-flights
 """
 import os
 import re
+import time
+import sqlite3
 import asyncio
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass, field
-from typing import Optional, Literal, cast, Dict, List
+from typing import Optional, Literal, Dict, Iterable, List, Set, TypeGuard, get_args
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import discord
 from discord import app_commands
@@ -24,8 +27,48 @@ from fast_flights import (
     Result,
 )
 
+# Strips everything but digits and the decimal point from a price string
+_PRICE_RE = re.compile(r"[^\d.]")
 
-@dataclass
+# Accepted slash command options (tuple keeps display order for error messages)
+SeatClass = Literal["economy", "premium-economy", "business", "first"]
+SEAT_CLASSES = get_args(SeatClass)
+_VALID_SEATS = frozenset(SEAT_CLASSES)
+_VALID_STOPS = frozenset({0, 1, 2})
+
+# Discord's maximum length for an embed field value
+EMBED_FIELD_LIMIT = 1024
+# Discord's maximum number of embeds in a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# Seconds to wait on a round-trip search before querying each leg separately.
+# wait_for can't cancel the worker thread, so a timed-out round-trip request keeps
+# running alongside the two one-way requests; only timeouts trigger the fallback.
+ROUND_TRIP_TIMEOUT = 10
+
+# Maximum number of get_flights calls in flight at once during tracker checks
+MAX_CONCURRENT_PROBES = 8
+
+# Hours between tracker price checks
+CHECK_INTERVAL_HOURS = 6
+
+# Worker threads for blocking get_flights/search_airport calls; must comfortably
+# exceed MAX_CONCURRENT_PROBES so slash commands aren't queued behind the tracker loop
+FLIGHTS_EXECUTOR_WORKERS = 32
+
+# Length of the short tracker ID shown to users and used for prefix lookups
+TRACKER_PREFIX_LEN = 8
+
+# Seconds a get_flights result is reused for identical tracker queries
+FLIGHT_CACHE_TTL = 3600
+
+# Shared across trackers: {query key: (monotonic timestamp, result)}
+_flight_cache: Dict[tuple, tuple] = {}
+# One lock per query key so concurrent identical lookups share a single fetch
+_flight_cache_locks: Dict[tuple, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+@dataclass(slots=True)
 class FlightTracker:
     """Stores information about a flight being tracked"""
     user_id: int
@@ -36,24 +79,148 @@ class FlightTracker:
     end_date: str
     max_price: float  # Price threshold in dollars
     adults: int
-    seat_class: str
+    seat_class: SeatClass
     max_stops: Optional[int]
     last_checked: datetime = field(default_factory=datetime.now)
     last_price: Optional[float] = None
     tracker_id: str = field(default_factory=lambda: str(datetime.now().timestamp()))
 
 
+class TrackerStore:
+    """SQLite-backed persistence so trackers survive bot restarts"""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS trackers (
+                tracker_id TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                origin TEXT NOT NULL,
+                destination TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                max_price REAL NOT NULL,
+                adults INTEGER NOT NULL,
+                seat_class TEXT NOT NULL,
+                max_stops INTEGER,
+                last_checked TEXT NOT NULL,
+                last_price REAL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def load_all(self) -> List[FlightTracker]:
+        """Load every stored tracker"""
+        rows = self.conn.execute(
+            "SELECT tracker_id, user_id, channel_id, origin, destination, start_date, end_date,"
+            " max_price, adults, seat_class, max_stops, last_checked, last_price FROM trackers"
+        ).fetchall()
+        return [
+            FlightTracker(
+                tracker_id=row[0],
+                user_id=row[1],
+                channel_id=row[2],
+                origin=row[3],
+                destination=row[4],
+                start_date=row[5],
+                end_date=row[6],
+                max_price=row[7],
+                adults=row[8],
+                seat_class=row[9],
+                max_stops=row[10],
+                last_checked=datetime.fromisoformat(row[11]),
+                last_price=row[12],
+            )
+            for row in rows
+        ]
+
+    def insert(self, tracker: FlightTracker):
+        """Persist a new tracker"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO trackers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                tracker.tracker_id,
+                tracker.user_id,
+                tracker.channel_id,
+                tracker.origin,
+                tracker.destination,
+                tracker.start_date,
+                tracker.end_date,
+                tracker.max_price,
+                tracker.adults,
+                tracker.seat_class,
+                tracker.max_stops,
+                tracker.last_checked.isoformat(),
+                tracker.last_price,
+            ),
+        )
+        self.conn.commit()
+
+    def delete(self, tracker_id: str):
+        """Delete a stored tracker"""
+        self.conn.execute("DELETE FROM trackers WHERE tracker_id = ?", (tracker_id,))
+        self.conn.commit()
+
+    def update_checks(self, trackers: Iterable[FlightTracker]):
+        """Write back last_price/last_checked for many trackers in one transaction"""
+        self.conn.executemany(
+            "UPDATE trackers SET last_price = ?, last_checked = ? WHERE tracker_id = ?",
+            [(t.last_price, t.last_checked.isoformat(), t.tracker_id) for t in trackers],
+        )
+        self.conn.commit()
+
+
 class FlightBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
         super().__init__(command_prefix="!", intents=intents)
         # Store active trackers: {tracker_id: FlightTracker}
         self.trackers: Dict[str, FlightTracker] = {}
-        # Store trackers by user: {user_id: [tracker_ids]}
-        self.user_trackers: Dict[int, List[str]] = defaultdict(list)
+        # Store trackers by user: {user_id: {tracker_ids}}
+        self.user_trackers: Dict[int, Set[str]] = defaultdict(set)
+        # Index trackers by short ID prefix: {tracker_id[:TRACKER_PREFIX_LEN]: [tracker_ids]}
+        self.prefix_index: Dict[str, List[str]] = defaultdict(list)
+        # Opened in setup_hook so importing this module doesn't create the database
+        self.store: TrackerStore
+
+    def add_tracker(self, tracker: FlightTracker):
+        """Persist a tracker, then register it in all lookup tables"""
+        self.store.insert(tracker)
+        self._index_tracker(tracker)
+
+    def _index_tracker(self, tracker: FlightTracker):
+        self.trackers[tracker.tracker_id] = tracker
+        self.user_trackers[tracker.user_id].add(tracker.tracker_id)
+        self.prefix_index[tracker.tracker_id[:TRACKER_PREFIX_LEN]].append(tracker.tracker_id)
+
+    def drop_tracker(self, tracker_id: str):
+        """Delete a tracker from storage, then remove it from all lookup tables"""
+        self.store.delete(tracker_id)
+        tracker = self.trackers.pop(tracker_id)
+        self.user_trackers[tracker.user_id].discard(tracker_id)
+        prefix = tracker_id[:TRACKER_PREFIX_LEN]
+        bucket = self.prefix_index.get(prefix)
+        if bucket and tracker_id in bucket:
+            bucket.remove(tracker_id)
+            if not bucket:
+                del self.prefix_index[prefix]
 
     async def setup_hook(self):
         """Sync slash commands when bot starts"""
+        # asyncio.to_thread runs on the default executor, which is only
+        # min(32, cpu_count + 4) threads wide on small hosts
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=FLIGHTS_EXECUTOR_WORKERS, thread_name_prefix="flights")
+        )
+        # Rehydrate trackers saved before the last restart
+        self.store = TrackerStore(os.getenv("TRACKER_DB_PATH", "trackers.db"))
+        for tracker in self.store.load_all():
+            self._index_tracker(tracker)
+        print(f"Loaded {len(self.trackers)} saved trackers")
         await self.tree.sync()
         print("Slash commands synced!")
         # Start the background task
@@ -96,37 +263,36 @@ def format_stops(stops) -> str:
     return str(stops)
 
 
+def is_seat_class(value: str) -> TypeGuard[SeatClass]:
+    """Check a slash command seat class option, narrowing it to SeatClass"""
+    return value in _VALID_SEATS
+
+
 def parse_price(price_str: str) -> Optional[float]:
     """Parse price string to float (handles formats like '$500', '500', '$1,234')"""
     if not price_str:
         return None
     # Remove currency symbols and commas, extract numbers
-    price_clean = re.sub(r'[^\d.]', '', price_str.replace(',', ''))
     try:
-        return float(price_clean)
+        return float(_PRICE_RE.sub("", price_str))
     except ValueError:
         return None
 
 
-def get_dates_in_range(start_date: str, end_date: str) -> List[str]:
-    """Get all dates in range (YYYY-MM-DD format)"""
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    dates = []
-    current = start
-    while current <= end:
-        dates.append(current.strftime("%Y-%m-%d"))
-        current += timedelta(days=1)
-    return dates
-
-
-def create_flight_embed(result: Result, origin: str, destination: str, date: str, trip_type: str) -> discord.Embed:
-    """Create a Discord embed for flight results"""
+def create_flight_embed(
+    result: Result,
+    origin: str,
+    destination: str,
+    date: str,
+    trip_type: str,
+    now: Optional[datetime] = None,
+) -> discord.Embed:
+    """Create a Discord embed for flight results, stamped with `now` (defaults to the current time)"""
     embed = discord.Embed(
         title="Flight Search Results",
         description=f"**{origin.upper()}** -> **{destination.upper()}**\nDate: {date}",
         color=discord.Color.blue(),
-        timestamp=datetime.now(),
+        timestamp=now or datetime.now(),
     )
 
     # Add price status
@@ -144,32 +310,29 @@ def create_flight_embed(result: Result, origin: str, destination: str, date: str
         inline=True,
     )
 
-    # Show top 5 flights (or fewer if less available)
-    flights_to_show = result.flights[:5]
-    embed.add_field(
-        name=f"Top {len(flights_to_show)} Flights",
-        value="\u200b",  # Zero-width space for spacing
-        inline=False,
-    )
-
-    for i, flight in enumerate(flights_to_show, 1):
-        # Format flight info
+    # Show top 5 flights (or fewer if less available) in a single field
+    lines = []
+    for i, flight in enumerate(result.flights[:5], 1):
         best_badge = " [BEST]" if flight.is_best else ""
         delay_info = f" | Delay: {flight.delay}" if flight.delay else ""
         arrival_ahead = f" {flight.arrival_time_ahead}" if flight.arrival_time_ahead else ""
-
-        flight_info = (
-            f"**{flight.name}**{best_badge}\n"
+        # Adjacent f-strings compile to a single format operation
+        lines.append(
+            f"{i}. **{flight.name}**{best_badge}\n"
             f"Depart: {flight.departure} -> Arrive: {flight.arrival}{arrival_ahead}\n"
             f"Duration: {flight.duration} | {format_stops(flight.stops)}\n"
             f"Price: **{flight.price}**{delay_info}"
         )
 
-        embed.add_field(
-            name=f"Flight {i}",
-            value=flight_info,
-            inline=False,
-        )
+    # Discord caps field values, so drop whole flights rather than cut one in half
+    while len(lines) > 1 and len("\n\n".join(lines)) > EMBED_FIELD_LIMIT:
+        lines.pop()
+
+    embed.add_field(
+        name=f"Top {len(lines)} Flights",
+        value="\n\n".join(lines)[:EMBED_FIELD_LIMIT] or "\u200b",
+        inline=False,
+    )
 
     embed.set_footer(text="Powered by fast-flights | Google Flights")
     return embed
@@ -211,22 +374,14 @@ async def search_flight(
         return
 
     # Validate seat class
-    valid_seat_classes: list[Literal["economy", "premium-economy", "business", "first"]] = [
-        "economy", "premium-economy", "business", "first"
-    ]
-    if seat_class not in valid_seat_classes:
+    if not is_seat_class(seat_class):
         await interaction.followup.send(
-            f"Error: Invalid seat class. Must be one of: {', '.join(valid_seat_classes)}."
+            f"Error: Invalid seat class. Must be one of: {', '.join(SEAT_CLASSES)}."
         )
         return
-    
-    # Cast to proper literal type
-    seat_class_literal: Literal["economy", "premium-economy", "business", "first"] = cast(
-        Literal["economy", "premium-economy", "business", "first"], seat_class
-    )
 
     # Validate max_stops
-    if max_stops is not None and max_stops not in [0, 1, 2]:
+    if max_stops is not None and max_stops not in _VALID_STOPS:
         await interaction.followup.send("Error: max_stops must be 0, 1, or 2.")
         return
 
@@ -243,19 +398,76 @@ async def search_flight(
             FlightData(date=date, from_airport=origin.upper(), to_airport=destination.upper())
         ]
 
-    try:
+    def search(legs: List[FlightData], trip: Literal["round-trip", "one-way", "multi-city"]):
         # Search for flights (using html data_source to get Result type)
-        result = await asyncio.to_thread(
+        return asyncio.to_thread(
             get_flights,
-            flight_data=flight_data,
-            trip=trip_type,
-            seat=seat_class_literal,
+            flight_data=legs,
+            trip=trip,
+            seat=seat_class,
             passengers=Passengers(adults=adults, children=0, infants_in_seat=0, infants_on_lap=0),
             fetch_mode="fallback",  # Use fallback mode for better reliability
             max_stops=max_stops,
             data_source="html",  # Use html to get Result type instead of DecodedResult
         )
 
+    try:
+        if return_date:
+            try:
+                result = await asyncio.wait_for(search(flight_data, trip_type), timeout=ROUND_TRIP_TIMEOUT)
+            except asyncio.TimeoutError:
+                # Round-trip lookup is stalling; fetch both legs concurrently instead
+                print("Round-trip search timed out, searching each leg separately")
+                legs = [
+                    ("Outbound", date, origin, destination),
+                    ("Return", return_date, destination, origin),
+                ]
+                leg_results = await asyncio.gather(
+                    *(
+                        search([FlightData(date=d, from_airport=o.upper(), to_airport=t.upper())], "one-way")
+                        for _, d, o, t in legs
+                    ),
+                    return_exceptions=True,
+                )
+                # Nothing to show if both legs errored, so surface the real error
+                leg_errors = [r for r in leg_results if isinstance(r, BaseException)]
+                if len(leg_errors) == len(leg_results):
+                    raise leg_errors[0]
+
+                embeds = []
+                failure_notes = []
+                empty_notes = []
+                now = datetime.now()
+                for (label, d, o, t), leg_result in zip(legs, leg_results):
+                    if isinstance(leg_result, BaseException):
+                        print(f"{label} leg search failed: {leg_result!r}")
+                        failure_notes.append(f"Warning: the {label.lower()} flight search failed.")
+                    elif isinstance(leg_result, Result) and leg_result.flights:
+                        embed = create_flight_embed(leg_result, o, t, d, "one-way", now)
+                        embed.title = f"{label} Flight Results"
+                        embeds.append(embed)
+                    else:
+                        empty_notes.append(f"No {label.lower()} flights found on {d}.")
+
+                if not embeds:
+                    await interaction.followup.send(
+                        "\n".join(
+                            [f"No flights found for {origin.upper()} <-> {destination.upper()} "
+                             f"on {date} / {return_date}."] + failure_notes
+                        )
+                    )
+                    return
+
+                # Explain any leg missing from the reply so a single embed isn't ambiguous
+                notes = failure_notes + empty_notes
+                if notes:
+                    await interaction.followup.send("\n".join(notes), embeds=embeds)
+                else:
+                    await interaction.followup.send(embeds=embeds)
+                return
+        else:
+            result = await search(flight_data, trip_type)
+
         # Type check - ensure we have a Result object
         if result is None:
             await interaction.followup.send(
@@ -352,21 +564,14 @@ async def track_flight(
         return
 
     # Validate seat class
-    valid_seat_classes: list[Literal["economy", "premium-economy", "business", "first"]] = [
-        "economy", "premium-economy", "business", "first"
-    ]
-    if seat_class not in valid_seat_classes:
+    if not is_seat_class(seat_class):
         await interaction.followup.send(
-            f"Error: Invalid seat class. Must be one of: {', '.join(valid_seat_classes)}."
+            f"Error: Invalid seat class. Must be one of: {', '.join(SEAT_CLASSES)}."
         )
         return
-    
-    seat_class_literal: Literal["economy", "premium-economy", "business", "first"] = cast(
-        Literal["economy", "premium-economy", "business", "first"], seat_class
-    )
 
     # Validate max_stops
-    if max_stops is not None and max_stops not in [0, 1, 2]:
+    if max_stops is not None and max_stops not in _VALID_STOPS:
         await interaction.followup.send("Error: max_stops must be 0, 1, or 2.")
         return
 
@@ -408,8 +613,11 @@ async def track_flight(
     )
 
     # Store tracker
-    bot.trackers[tracker.tracker_id] = tracker
-    bot.user_trackers[interaction.user.id].append(tracker.tracker_id)
+    try:
+        bot.add_tracker(tracker)
+    except sqlite3.Error as e:
+        await interaction.followup.send(f"Error saving tracker: {str(e)}")
+        return
 
     embed = discord.Embed(
         title="Flight Tracking Started",
@@ -422,7 +630,7 @@ async def track_flight(
     embed.add_field(name="Seat Class", value=seat_class.replace("-", " ").title(), inline=True)
     if max_stops is not None:
         embed.add_field(name="Max Stops", value=str(max_stops), inline=True)
-    embed.add_field(name="Tracker ID", value=tracker.tracker_id[:8], inline=False)
+    embed.add_field(name="Tracker ID", value=tracker.tracker_id[:TRACKER_PREFIX_LEN], inline=False)
     embed.set_footer(text="You'll be notified when prices drop below your threshold!")
 
     await interaction.followup.send(embed=embed)
@@ -434,13 +642,14 @@ async def list_trackers(interaction: discord.Interaction):
     if not await safe_defer(interaction):
         return
 
-    user_tracker_ids = bot.user_trackers.get(interaction.user.id, [])
+    user_tracker_ids = bot.user_trackers.get(interaction.user.id, set())
     
     if not user_tracker_ids:
         await interaction.followup.send("No active flight trackers found.")
         return
 
-    trackers = [bot.trackers[tid] for tid in user_tracker_ids if tid in bot.trackers]
+    # Tracker IDs are creation timestamps, so sorting keeps the numbering stable
+    trackers = [bot.trackers[tid] for tid in sorted(user_tracker_ids) if tid in bot.trackers]
     
     if not trackers:
         await interaction.followup.send("No active trackers found.")
@@ -458,7 +667,7 @@ async def list_trackers(interaction: discord.Interaction):
             f"**Dates:** {tracker.start_date} to {tracker.end_date}\n"
             f"**Alert:** <= ${tracker.max_price:.2f}\n"
             f"**Last Price:** {last_price_str}\n"
-            f"**ID:** `{tracker.tracker_id[:8]}`"
+            f"**ID:** `{tracker.tracker_id[:TRACKER_PREFIX_LEN]}`"
         )
         embed.add_field(
             name=f"Tracker {i}",
@@ -476,10 +685,15 @@ async def remove_tracker(interaction: discord.Interaction, tracker_id: str):
     if not await safe_defer(interaction):
         return
 
-    # Find tracker by partial ID
+    # Find tracker by partial ID, using the prefix index unless the ID is too short
+    user_tracker_ids = bot.user_trackers.get(interaction.user.id, set())
+    if len(tracker_id) >= TRACKER_PREFIX_LEN:
+        candidates = bot.prefix_index.get(tracker_id[:TRACKER_PREFIX_LEN], [])
+    else:
+        candidates = user_tracker_ids
     matching_trackers = [
-        (tid, t) for tid, t in bot.trackers.items()
-        if tid.startswith(tracker_id) and t.user_id == interaction.user.id
+        (tid, bot.trackers[tid]) for tid in candidates
+        if tid.startswith(tracker_id) and tid in user_tracker_ids and tid in bot.trackers
     ]
 
     if not matching_trackers:
@@ -496,10 +710,12 @@ async def remove_tracker(interaction: discord.Interaction, tracker_id: str):
 
     full_id, tracker = matching_trackers[0]
     
-    # Remove from both dicts
-    del bot.trackers[full_id]
-    if full_id in bot.user_trackers[interaction.user.id]:
-        bot.user_trackers[interaction.user.id].remove(full_id)
+    # Remove from storage and all lookup tables
+    try:
+        bot.drop_tracker(full_id)
+    except sqlite3.Error as e:
+        await interaction.followup.send(f"Error removing tracker: {str(e)}")
+        return
 
     embed = discord.Embed(
         title="Tracker Removed",
@@ -509,134 +725,268 @@ async def remove_tracker(interaction: discord.Interaction, tracker_id: str):
     await interaction.followup.send(embed=embed)
 
 
-@tasks.loop(hours=6)  # Check every 6 hours
+def sample_tracker_dates(tracker: FlightTracker) -> List[str]:
+    """Sample up to 5 evenly spaced dates from a tracker's range"""
+    start = date.fromisoformat(tracker.start_date).toordinal()
+    end = date.fromisoformat(tracker.end_date).toordinal()
+    days = end - start + 1
+    step = max(1, days // 5)
+    # Check up to 5 dates to avoid too many API calls
+    return [date.fromordinal(start + i * step).isoformat() for i in range(min(5, (days + step - 1) // step))]
+
+
+class RateLimiter:
+    """Token bucket allowing max_rate acquisitions per time_period seconds"""
+
+    def __init__(self, max_rate: float, time_period: float):
+        self.max_rate = max_rate
+        self.rate = max_rate / time_period
+        self.tokens = max_rate
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.max_rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+# Caps outbound tracker probes at 5 per 10 seconds, however long each one takes
+probe_limiter = RateLimiter(5, 10)
+
+
+async def cached_get_flights(key: tuple, sem: asyncio.Semaphore, **kwargs):
+    """Call get_flights, reusing a fresh cached result for an identical query key"""
+    async with _flight_cache_locks[key]:
+        entry = _flight_cache.get(key)
+        if entry and time.monotonic() - entry[0] < FLIGHT_CACHE_TTL:
+            return entry[1]
+        async with sem, probe_limiter:
+            result = await asyncio.to_thread(get_flights, **kwargs)
+        _flight_cache[key] = (time.monotonic(), result)
+        return result
+
+
+def purge_flight_cache():
+    """Drop cached get_flights results older than FLIGHT_CACHE_TTL, and idle orphaned locks"""
+    now = time.monotonic()
+    expired = [key for key, (ts, _) in _flight_cache.items() if now - ts >= FLIGHT_CACHE_TTL]
+    for key in expired:
+        del _flight_cache[key]
+    # Locks for failed or expired lookups have no cache entry and would otherwise pile up
+    orphaned = [
+        key for key, lock in _flight_cache_locks.items()
+        if key not in _flight_cache and not lock.locked()
+    ]
+    for key in orphaned:
+        del _flight_cache_locks[key]
+
+
+async def probe_tracker_date(
+    tracker: FlightTracker, date: str, sem: asyncio.Semaphore
+) -> Optional[Result]:
+    """Fetch one-way flights for a single tracker date, bounded by the semaphore"""
+    key = (
+        tracker.origin,
+        tracker.destination,
+        date,
+        tracker.seat_class,
+        tracker.max_stops,
+        tracker.adults,
+    )
+    result = await cached_get_flights(
+        key,
+        sem,
+        flight_data=[
+            FlightData(
+                date=date,
+                from_airport=tracker.origin,
+                to_airport=tracker.destination
+            )
+        ],
+        trip="one-way",
+        seat=tracker.seat_class,
+        passengers=Passengers(
+            adults=tracker.adults,
+            children=0,
+            infants_in_seat=0,
+            infants_on_lap=0
+        ),
+        fetch_mode="fallback",
+        max_stops=tracker.max_stops,
+        data_source="html",
+    )
+    if result and isinstance(result, Result) and result.flights:
+        return result
+    return None
+
+
+@tasks.loop(hours=CHECK_INTERVAL_HOURS)
 async def check_tracked_flights():
     """Background task to check tracked flights and send notifications"""
     if not bot.trackers:
         return
 
-    print(f"Checking {len(bot.trackers)} tracked flights...")
-
-    for tracker_id, tracker in list(bot.trackers.items()):
-        try:
-            # Get dates to check (sample a few dates from the range)
-            dates = get_dates_in_range(tracker.start_date, tracker.end_date)
-            # Check up to 5 dates to avoid too many API calls
-            dates_to_check = dates[::max(1, len(dates) // 5)][:5]
-
-            best_price = None
-            best_date = None
-            best_flight = None
-
-            for date in dates_to_check:
-                try:
-                    result = await asyncio.to_thread(
-                        get_flights,
-                        flight_data=[
-                            FlightData(
-                                date=date,
-                                from_airport=tracker.origin,
-                                to_airport=tracker.destination
-                            )
-                        ],
-                        trip="one-way",
-                        seat=cast(Literal["economy", "premium-economy", "business", "first"], tracker.seat_class),
-                        passengers=Passengers(
-                            adults=tracker.adults,
-                            children=0,
-                            infants_in_seat=0,
-                            infants_on_lap=0
-                        ),
-                        fetch_mode="fallback",
-                        max_stops=tracker.max_stops,
-                        data_source="html",
-                    )
+    snapshot = tuple(bot.trackers.items())
+    if check_tracked_flights.current_loop == 0:
+        # First pass after a restart: reuse prices saved by the previous process for
+        # trackers checked within the last interval instead of re-probing and re-alerting.
+        # last_checked starts at creation time, so a tracker with no saved price yet
+        # has never been swept and is always probed.
+        cutoff = datetime.now() - timedelta(hours=CHECK_INTERVAL_HOURS)
+        snapshot = tuple(
+            (tracker_id, tracker) for tracker_id, tracker in snapshot
+            if tracker.last_price is None or tracker.last_checked < cutoff
+        )
+        if not snapshot:
+            print("All saved trackers were checked recently, skipping this pass")
+            return
 
-                    if result and isinstance(result, Result) and result.flights:
-                        # Find cheapest flight
-                        for flight in result.flights:
-                            price = parse_price(flight.price)
-                            if price and (best_price is None or price < best_price):
-                                best_price = price
-                                best_date = date
-                                best_flight = flight
+    print(f"Checking {len(snapshot)} tracked flights...")
+    purge_flight_cache()
 
-                    # Small delay between requests
-                    await asyncio.sleep(2)
+    # Fan out every (tracker, date) probe at once; the semaphore keeps us polite
+    sem = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+    probes = []
+    for tracker_id, tracker in snapshot:
+        try:
+            for date in sample_tracker_dates(tracker):
+                probes.append((tracker_id, tracker, date))
+        except Exception as e:
+            print(f"Error processing tracker {tracker_id}: {e}")
 
-                except Exception as e:
-                    print(f"Error checking {tracker.origin} -> {tracker.destination} on {date}: {e}")
-                    continue
+    results = await asyncio.gather(
+        *(probe_tracker_date(tracker, date, sem) for _, tracker, date in probes),
+        return_exceptions=True,
+    )
 
+    # Reduce probe results to the cheapest flight per tracker
+    best: Dict[str, tuple] = {}
+    for (tracker_id, tracker, date), result in zip(probes, results):
+        if isinstance(result, BaseException):
+            print(f"Error checking {tracker.origin} -> {tracker.destination} on {date}: {result}")
+            continue
+        if result is None:
+            continue
+        # Find cheapest flight, parsing each price once
+        priced = [(p, f) for f in result.flights if (p := parse_price(f.price))]
+        if priced:
+            price, flight = min(priced, key=lambda pf: pf[0])
+            if tracker_id not in best or price < best[tracker_id][0]:
+                best[tracker_id] = (price, date, flight)
+
+    # One timestamp for the whole sweep keeps last_checked and alert times consistent
+    now = datetime.now()
+    # Alerts are grouped per channel so they go out as few messages as possible
+    alerts_by_channel: Dict[int, List[tuple]] = defaultdict(list)
+    for tracker_id, tracker in snapshot:
+        # Skip trackers removed while their probes were in flight
+        if bot.trackers.get(tracker_id) is not tracker:
+            continue
+        try:
             # Update tracker
-            tracker.last_checked = datetime.now()
-            
+            tracker.last_checked = now
+
             # Check if we should send notification
-            if best_price is not None:
-                tracker.last_price = best_price
-                
-                # Send notification if price is below threshold
-                if best_price <= tracker.max_price:
-                    try:
-                        channel = bot.get_channel(tracker.channel_id)
-                        if channel:
-                            user = bot.get_user(tracker.user_id)
-                            mention = user.mention if user else f"<@{tracker.user_id}>"
-                            
-                            embed = discord.Embed(
-                                title="Price Alert",
-                                description=f"Flight price dropped below your threshold!",
-                                color=discord.Color.green(),
-                                timestamp=datetime.now(),
-                            )
-                            embed.add_field(
-                                name="Route",
-                                value=f"{tracker.origin} -> {tracker.destination}",
-                                inline=False,
-                            )
-                            embed.add_field(
-                                name="Date",
-                                value=best_date,
-                                inline=True,
-                            )
-                            embed.add_field(
-                                name="Price",
-                                value=f"${best_price:.2f}",
-                                inline=True,
-                            )
-                            embed.add_field(
-                                name="Your Threshold",
-                                value=f"${tracker.max_price:.2f}",
-                                inline=True,
-                            )
-                            
-                            if best_flight:
-                                embed.add_field(
-                                    name="Flight Details",
-                                    value=(
-                                        f"**{best_flight.name}**\n"
-                                        f"Depart: {best_flight.departure} -> Arrive: {best_flight.arrival}\n"
-                                        f"Duration: {best_flight.duration} | {format_stops(best_flight.stops)}"
-                                    ),
-                                    inline=False,
-                                )
-                            
-                            embed.set_footer(text=f"Tracker ID: {tracker_id[:8]}")
-                            
-                            await channel.send(f"{mention}", embed=embed)
-                            print(f"Sent price alert for {tracker.origin} -> {tracker.destination}")
-                            
-                            # Remove tracker after alert (optional - comment out if you want to keep tracking)
-                            # del bot.trackers[tracker_id]
-                            # if tracker_id in bot.user_trackers[tracker.user_id]:
-                            #     bot.user_trackers[tracker.user_id].remove(tracker_id)
-                            
-                    except Exception as e:
-                        print(f"Error sending notification: {e}")
+            if tracker_id not in best:
+                continue
+            best_price, best_date, best_flight = best[tracker_id]
+            tracker.last_price = best_price
+
+            # Queue notification if price is below threshold
+            if best_price <= tracker.max_price:
+                embed = discord.Embed(
+                    title="Price Alert",
+                    description=f"Flight price dropped below your threshold!",
+                    color=discord.Color.green(),
+                    timestamp=now,
+                )
+                embed.add_field(
+                    name="Route",
+                    value=f"{tracker.origin} -> {tracker.destination}",
+                    inline=False,
+                )
+                embed.add_field(
+                    name="Date",
+                    value=best_date,
+                    inline=True,
+                )
+                embed.add_field(
+                    name="Price",
+                    value=f"${best_price:.2f}",
+                    inline=True,
+                )
+                embed.add_field(
+                    name="Your Threshold",
+                    value=f"${tracker.max_price:.2f}",
+                    inline=True,
+                )
+
+                if best_flight:
+                    embed.add_field(
+                        name="Flight Details",
+                        value=(
+                            f"**{best_flight.name}**\n"
+                            f"Depart: {best_flight.departure} -> Arrive: {best_flight.arrival}\n"
+                            f"Duration: {best_flight.duration} | {format_stops(best_flight.stops)}"
+                        ),
+                        inline=False,
+                    )
+
+                embed.set_footer(text=f"Tracker ID: {tracker_id[:TRACKER_PREFIX_LEN]}")
+                alerts_by_channel[tracker.channel_id].append((tracker, embed))
+
+                # Remove tracker after alert (optional - comment out if you want to keep tracking)
+                # bot.drop_tracker(tracker_id)
 
         except Exception as e:
             print(f"Error processing tracker {tracker_id}: {e}")
 
+    for channel_id, alerts in alerts_by_channel.items():
+        # Earlier sends yield to the event loop, so drop alerts for trackers removed since
+        alerts = [(t, e) for t, e in alerts if bot.trackers.get(t.tracker_id) is t]
+        if not alerts:
+            continue
+        channel = bot.get_channel(channel_id)
+        if not channel:
+            continue
+        for i in range(0, len(alerts), MAX_EMBEDS_PER_MESSAGE):
+            batch = alerts[i:i + MAX_EMBEDS_PER_MESSAGE]
+            # Mention each user once, in alert order
+            user_ids = dict.fromkeys(tracker.user_id for tracker, _ in batch)
+            try:
+                await channel.send(
+                    " ".join(f"<@{user_id}>" for user_id in user_ids),
+                    embeds=[embed for _, embed in batch],
+                )
+            except Exception as e:
+                # Skip only this batch; later batches for the channel still go out
+                print(f"Error sending notification: {e}")
+                continue
+            for tracker, _ in batch:
+                print(f"Sent price alert for {tracker.origin} -> {tracker.destination}")
+
+    # Persist the latest prices in one batch for trackers that are still active
+    try:
+        bot.store.update_checks(
+            tracker for tracker_id, tracker in snapshot if bot.trackers.get(tracker_id) is tracker
+        )
+    except sqlite3.Error as e:
+        print(f"Error saving tracker state: {e}")
+
 
 @check_tracked_flights.before_loop
 async def before_check_tracked_flights():